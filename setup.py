@@ -1,63 +1,37 @@
-import re
-import os
-from pathlib import Path
+import ast
+import sys
 from setuptools import setup
 
 
 def find_version(filename):
-    _version_re = re.compile(r"__version__ = '(.*)'")
-    for line in open(filename):
-        version_match = _version_re.match(line)
-        if version_match:
-            return version_match.group(1)
+    with open(filename, 'rt', encoding='utf-8') as f:
+        src = f.read()
+
+    tree = ast.parse(src, filename=filename)
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = node.target,
+        else:
+            continue
+
+        if any(isinstance(t, ast.Name) and t.id == '__version__' for t in targets):
+            return ast.literal_eval(node.value)
 
 
 __version__ = find_version('sparcur/__init__.py')
 
-with open('README.md', 'rt') as f:
-    long_description = f.read()
+# long_description only ends up in distributed metadata
+# so skip reading it when all we are asked for is a metadata field
+_meta_only = len(sys.argv) >= 2 and sys.argv[1] in ('--version', '--name', 'egg_info', 'clean')
+if _meta_only:
+    long_description = ''
+else:
+    with open('README.md', 'rt', encoding='utf-8') as f:
+        long_description = f.read()
 
-tests_require = ['pytest', 'pytest-runner']
-setup(name='sparcur',
-      version=__version__,
-      description='assorted',
+# everything static lives in setup.cfg
+setup(version=__version__,
       long_description=long_description,
-      long_description_content_type='text/markdown',
-      url='https://github.com/tgbugs/sparc-curation',
-      author='Tom Gillespie',
-      author_email='tgbugs@gmail.com',
-      license='MIT',
-      classifiers=[
-          'Development Status :: 3 - Alpha',
-          'License :: OSI Approved :: MIT License',
-          'Programming Language :: Python :: 3.6',
-          'Programming Language :: Python :: 3.7',
-      ],
-      keywords='SPARC curation biocuration ontology blackfynn protc protocols hypothesis',
-      packages=['sparcur'],
-      python_requires='>=3.6',
-      tests_require=tests_require,
-      install_requires=[
-          'augpathlib>=0.0.4',
-          'beautifulsoup4',
-          'blackfynn',
-          'dicttoxml',
-          'google-api-python-client',
-          'idlib',
-          'jsonschema>=3.0.1',  # need the draft 6 validator
-          'protcur>=0.0.2',
-          'pyontutils>=0.1.8',
-          'pysercomb>=0.0.3',
-          'terminaltables',
-          'xlsx2csv',
-      ],
-      extras_require={'filetypes': ['nibabel', 'pydicom', 'scipy'],
-                      'test': tests_require},
-      scripts=[],
-      entry_points={
-          'console_scripts': [
-              'spc=sparcur.cli:main',
-          ],
-      },
-      data_files=[]
      )
@@ -1,7 +1,6 @@
 import os
 from pathlib import PurePosixPath, PurePath
 from datetime import datetime
-import requests
 from pyontutils.utils import Async, deferred
 from sparcur import exceptions as exc
 from sparcur.utils import log
@@ -10,6 +9,7 @@ import augpathlib as aug
 from augpathlib import PathMeta
 from augpathlib.remotes import RemoteFactory
 from sparcur.blackfynn_api import BFLocal, FakeBFLocal  # FIXME there should be a better way ...
+from sparcur.blackfynn_api import data_session
 from blackfynn import Collection, DataPackage, Organization, File
 from blackfynn import Dataset
 from blackfynn.models import BaseNode
@@ -100,7 +100,7 @@ class BlackfynnRemote(aug.RemotePath):
     @classmethod
     def get_file_by_url(cls, url):
         """ NOTE THAT THE FIRST YIELD IS HEADERS """
-        resp = requests.get(url, stream=True)
+        resp = data_session().get(url, stream=True)
         headers = resp.headers
         yield headers
         log.debug(f'reading from {url}')
@@ -2,11 +2,9 @@ import io
 import os
 import json
 import types
+import atexit
 import asyncio
 from copy import deepcopy
-#from nibabel import nifti1
-#from pydicom import dcmread
-#from scipy.io import loadmat
 import yaml
 import boto3
 import botocore
@@ -185,6 +183,32 @@ def patch_session(self):
 bfb.ClientSession.session = patch_session
 
 
+_data_session = None
+
+
+def data_session():
+    """ shared session for signed url data transfers so that
+        repeated fetches reuse connections instead of paying
+        for a new tcp and tls handshake on every file """
+    global _data_session
+    if _data_session is None:
+        _data_session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=100,  # Async fetches share this from many threads
+            max_retries=Retry(
+                total=3,
+                backoff_factor=.5,
+                status_forcelist=[502, 503, 504]
+            )
+        )
+        _data_session.mount('http://', adapter)
+        _data_session.mount('https://', adapter)
+        atexit.register(_data_session.close)
+
+    return _data_session
+
+
 def get(self, id, update=True):
     return self._api.core.get(id, update=update)
 
@@ -205,7 +229,7 @@ def download(self, destination):
         # exact location
         f_local = destination
 
-    r = requests.get(self.url, stream=True)
+    r = data_session().get(self.url, stream=True)
     with io.open(f_local, 'wb') as f:
         for chunk in r.iter_content(chunk_size=1024):
             if chunk: f.write(chunk)
@@ -1112,11 +1136,33 @@ def mvp():
     return bf, bfiles
 
 
+def _filetype_loader(module, name, extra):
+    """ import filetype readers only when there are files that need them """
+    from importlib import import_module
+    try:
+        return getattr(import_module(module), name)
+    except ImportError as e:
+        raise ImportError(f'{module} is needed to load these files, '
+                          f'pip install sparcur[{extra}]') from e
+
+
 def process_files(bf, files):
     from IPython import embed
-    niftis = [nifti1.load(f.as_posix()) for f in files if '.nii' in f.suffixes]
-    mats = [loadmat(f.as_posix()) for f in files if '.mat' in f.suffixes]
-    dicoms = [dcmread(f.as_posix()) for f in files if '.dcm' in f.suffixes]  # loaded dicom files
+    niftis = [f for f in files if '.nii' in f.suffixes]
+    if niftis:
+        nifti1 = _filetype_loader('nibabel', 'nifti1', 'filetypes-nifti')
+        niftis = [nifti1.load(f.as_posix()) for f in niftis]
+
+    mats = [f for f in files if '.mat' in f.suffixes]
+    if mats:
+        loadmat = _filetype_loader('scipy.io', 'loadmat', 'filetypes-scipy')
+        mats = [loadmat(f.as_posix()) for f in mats]
+
+    dicoms = [f for f in files if '.dcm' in f.suffixes]
+    if dicoms:
+        dcmread = _filetype_loader('pydicom', 'dcmread', 'filetypes-dicom')
+        dicoms = [dcmread(f.as_posix()) for f in dicoms]  # loaded dicom files
+
     embed()  # XXX you will drop into an interactive terminal in this scope
 
 
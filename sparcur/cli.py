@@ -67,6 +67,7 @@ Commands:
 
                 options: --latest   run derived pipelines from latest json
                        : --open     open the output file using xopen
+                       : --skip-unchanged   skip when the json matches LATEST
 
     report      print a report on all datasets
 
@@ -133,6 +134,7 @@ Options:
 
     -t --tab-table          print simple table using tabs for copying
     -A --latest             run further export states from the latest primary export
+    --skip-unchanged        skip the export if the json is the same as LATEST
     -W --raw                run reporting on live data without export
 
     -S --sort-size-desc     sort by file size, largest first
@@ -150,16 +152,21 @@ Options:
     --log-location=PATH     folder into which logs are saved [default: ${SPARC_EXPORTS}/log/]
 """
 
+import io
+import os
 import re
 import sys
 import csv
 import json
 import errno
+import hashlib
 import types
 import pprint
-import logging
-from itertools import chain
-from collections import Counter, defaultdict
+from stat import S_ISDIR
+from operator import attrgetter, itemgetter
+from itertools import chain, groupby
+from functools import cached_property
+from collections import Counter
 import requests
 import htmlfn as hfn
 import ontquery as oq
@@ -167,26 +174,25 @@ from augpathlib import FileSize
 from augpathlib import RemotePath, AugmentedPath  # for debug
 from pyontutils import clifun as clif
 from pyontutils.core import OntResGit
-from pyontutils.utils import NOWDANGER, NOWISO, UTCNOWISO
+from pyontutils.utils import NOWDANGER, NOWISO, UTCNOWISO, Async, deferred
 from pyontutils.config import auth as pauth
 from pysercomb.pyr import units as pyru
-from terminaltables import AsciiTable
 from sparcur import config
 from sparcur import schemas as sc
 from sparcur import datasets as dat
 from sparcur import exceptions as exc
-from sparcur.core import JT, log, logd, JPointer, lj
+from sparcur.core import JT, log, logd, JPointer, lj, export_json_bytes, load_json_file
 from sparcur.core import OntId, OntTerm, get_all_errors, DictTransformer as DT, adops
-from sparcur.utils import python_identifier, want_prefixes
+from sparcur.utils import python_identifier, want_prefixes, copy_and_checksum, file_checksum
+from sparcur.utils import BufferedFileHandler
 from sparcur.paths import Path, BlackfynnCache, PathMeta, StashPath
 from sparcur.state import State
 from sparcur.derives import Derives as De
 from sparcur.backends import BlackfynnRemote
 from sparcur.curation import PathData, Summary, Integrator, ExporterSummarizer, DatasetObject
-from sparcur.curation import JEncode, TriplesExportDataset, TriplesExportSummary
+from sparcur.curation import TriplesExportDataset, TriplesExportSummary
 from sparcur.protocols import ProtocolData
 from sparcur.blackfynn_api import BFLocal
-from IPython import embed
 
 
 class Options(clif.Options):
@@ -210,18 +216,35 @@ class Dispatcher(clif.Dispatcher):
     spcignore = ('.git',
                  '.~lock',)
 
+    _align = {'l': 'left',
+              'c': 'center',
+              'r': 'right',}
+
     def _print_table(self, rows, title=None, align=None, ext=None):
-        """ ext is only used when self.options.server -> True """
+        """ ext is only used when self.options.server -> True
+            rows may be any iterable, it is only consumed
+            lazily when printing with --tab-table """
+        def tsv_lines(rows):
+            for r in rows:
+                yield '\t'.join((str(c) for c in r)) + '\n'
+
         def simple_tsv(rows):
-            return '\n'.join('\t'.join((str(c) for c in r)) for r in rows) + '\n'
+            return ''.join(tsv_lines(rows))
 
         if self.options.tab_table:
             if title:
                 print(title)
 
-            print(simple_tsv(rows))
+            # write rows as they are formatted instead of joining them all first
+            sys.stdout.writelines(tsv_lines(rows))
+            print()
+            return
 
-        elif self.options.server:
+        # everything else needs random access or the column widths
+        if not isinstance(rows, (list, tuple)):
+            rows = list(rows)
+
+        if self.options.server:
             if ext is not None:
                 if ext == '.tsv':
                     nowish = UTCNOWISO('seconds')
@@ -236,28 +259,74 @@ class Dispatcher(clif.Dispatcher):
             return hfn.render_table(rows[1:], *rows[0]), title
 
         else:
+            from terminaltables import AsciiTable
             table = AsciiTable(rows, title=title)
             if align:
                 assert len(align) == len(rows[0])
-                table.justify_columns = {i:('left' if v == 'l'
-                                            else ('center' if v == 'c'
-                                                  else ('right' if v == 'r' else 'left')))
+                table.justify_columns = {i:self._align.get(v, 'left')
                                          for i, v in enumerate(align)}
             print(table.table)
 
+    @property
+    def _root(self):
+        """ the top level dispatcher, used to share state
+            that is expensive to recompute with sub dispatchers """
+        root = self
+        while getattr(root, 'parent', None) is not None:
+            root = root.parent
+
+        return root
+
+    @cached_property
+    def integrator(self):
+        """ Integrator for the project root, project_path does not
+            change for the life of a dispatcher so build it once """
+        return Integrator(self.project_path)
+
+    @cached_property
+    def _meta_cache(self):
+        return {}
+
+    def _meta(self, path):
+        """ path.cache.meta memoized for the life of the dispatcher
+            since every access goes back to the xattrs, anything that
+            updates cached metadata must clear _meta_cache """
+        try:
+            return self._meta_cache[path]
+        except KeyError:
+            meta = self._meta_cache[path] = path.cache.meta
+            return meta
+
     def _print_paths(self, paths, title=None):
         if self.options.sort_size_desc:
-            key = lambda ps: -ps[-1]
+            sort_kwargs = dict(key=itemgetter(1), reverse=True)
         else:
-            key = lambda ps: ps
+            sort_kwargs = {}
+
+        def row(p):
+            # one stat per path instead of separate is_dir and exists calls
+            try:
+                is_dir = S_ISDIR(p.stat().st_mode)
+                exists = True
+            except OSError as e:
+                # broken symlinks, loops, and file parents end up here,
+                # the same errors pathlib exists and is_dir treat as missing
+                if e.errno not in (errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP):
+                    raise
+
+                is_dir = exists = False
+
+            if is_dir:
+                size = '/'
+            else:
+                meta = self._meta(p)
+                size = (meta.size if meta.size else '??') if meta else '_'
+
+            return p, size, 'x' if exists else ''
 
         rows = [['Path', 'size', '?'],
-                *((p, s.hr if isinstance(s, FileSize) else s, 'x' if p.exists() else '')
-                  for p, s in
-                  sorted(([p, ('/' if p.is_dir() else
-                               (p.cache.meta.size if p.cache.meta.size else '??')
-                               if p.cache.meta else '_')]
-                          for p in paths), key=key))]
+                *((p, s.hr if isinstance(s, FileSize) else s, e)
+                  for p, s, e in sorted((row(p) for p in paths), **sort_kwargs))]
         self._print_table(rows, title)
 
 
@@ -370,16 +439,21 @@ class Main(Dispatcher):
         RDFL = oq.plugin.get('rdflib')
         olr = Path(pauth.get_path('ontology-local-repo'))
         branch = 'methods'
-        for fn in ('methods', 'methods-helper', 'methods-core'):
-            org = OntResGit(olr / f'ttl/{fn}.ttl', ref=branch)
-            OntTerm.query.ladd(RDFL(org.graph, OntId))
 
-    @property
+        def load(fn):
+            return OntResGit(olr / f'ttl/{fn}.ttl', ref=branch).graph
+
+        # git reads and parsing are independent per file so load them together
+        graphs = Async()(deferred(load)(fn) for fn in ('methods', 'methods-helper', 'methods-core'))
+        for graph in graphs:
+            OntTerm.query.ladd(RDFL(graph, OntId))
+
+    @cached_property
     def project_name(self):
         return self.anchor.name
         #return self.bfl.organization.name
 
-    @property
+    @cached_property
     def project_id(self):
         #self.bfl.organization.id
         return self.anchor.id
@@ -416,6 +490,13 @@ class Main(Dispatcher):
     @property
     def _paths(self):
         """ all relevant paths determined by the flags that have been set """
+        for path, _ in self._paths_is_dir:
+            yield path
+
+    @property
+    def _paths_is_dir(self):
+        """ _paths as (path, is_dir) pairs, is_dir is None
+            unless it was already known from listing the parent """
         # but if you use the generator version of _paths
         # then if you add a folder to the previous path
         # then it will yeild that folder! which is SUPER COOL
@@ -426,42 +507,82 @@ class Main(Dispatcher):
 
         if self.options.only_meta:
             paths = (mp.absolute() for p in paths for mp in dat.DatasetStructureLax(p).meta_paths)
-            yield from paths
+            yield from ((p, None) for p in paths)
             return
 
         yield from self._build_paths(paths)
 
+    def _rchildren_entries(self, path):
+        """ path.rchildren as (path, DirEntry) pairs using os.scandir
+            so that file type checks come from the directory listing
+            like rglob a top level symlink to a directory is walked,
+            files, broken symlinks, and missing paths yield nothing,
+            and unreadable directories are skipped """
+        if not path.is_dir():
+            return
+
+        stack = [path]
+        while stack:
+            parent = stack.pop()
+            try:
+                entries = os.scandir(parent)
+            except PermissionError:
+                continue
+
+            with entries:
+                for entry in entries:
+                    child = parent / entry.name
+                    yield child, entry
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(child)
+
+    def _rchildren_is_dir(self, path):
+        """ path.rchildren as (path, is_dir) pairs, is_dir does
+            not need a stat for anything that is not a symlink """
+        for child, entry in self._rchildren_entries(path):
+            yield child, entry.is_dir()
+
+    def _rchildren_broken_symlinks(self, path):
+        """ broken symlinks under path, only symlinks are stated """
+        for child, entry in self._rchildren_entries(path):
+            if entry.is_symlink() and not os.path.exists(entry.path):
+                yield child
+
     def _build_paths(self, paths):
+        # options dispatch through the docopt arg map so read them once
+        only_no_file_id = self.options.only_no_file_id
+        empty = self.options.empty
+
         def inner(paths, level=0, stop=self.options.level):
             """ depth first traversal of children """
             for path in paths:
-                if self.options.only_no_file_id:
+                if only_no_file_id:
                     if (path.is_broken_symlink() and
-                        (path.cache.meta.file_id is None)):
-                        yield path
+                        (self._meta(path).file_id is None)):
+                        yield path, None
                         continue
 
-                elif self.options.empty:
+                elif empty:
                     if path.is_dir():
                         try:
                             next(path.children)
                             # if a path has children we still want to
                             # for empties in them to the level specified
                         except StopIteration:
-                            yield path
+                            yield path, True
                     else:
                         continue
                 else:
-                    yield path
+                    yield path, None
 
                 if stop is None:
-                    if self.options.only_no_file_id:
+                    if only_no_file_id:
                         for rc in path.rchildren:
                             if (rc.is_broken_symlink() and
-                                rc.cache.meta.file_id is None):
-                                yield rc
+                                self._meta(rc).file_id is None):
+                                yield rc, False
                     else:
-                        yield from path.rchildren
+                        yield from self._rchildren_is_dir(path)
 
                 elif level <= stop:
                     yield from inner(path.children, level + 1)
@@ -470,14 +591,14 @@ class Main(Dispatcher):
 
     @property
     def _dirs(self):
-        for p in self._paths:
-            if p.is_dir():
+        for p, is_dir in self._paths_is_dir:
+            if is_dir if is_dir is not None else p.is_dir():
                 yield p
 
     @property
     def _not_dirs(self):
-        for p in self._paths:
-            if not p.is_dir():
+        for p, is_dir in self._paths_is_dir:
+            if not (is_dir if is_dir is not None else p.is_dir()):
                 yield p
 
     def clone(self):
@@ -535,12 +656,16 @@ class Main(Dispatcher):
         if not dirs:
             dirs = cwd,
 
-        dirs = sorted(dirs, key=lambda d: d.name)
+        dirs = sorted(dirs, key=attrgetter('name'))
+
+        def index_locals(d):
+            # FIXME don't parse the fucking dates unless someone needs them you idiot
+            return [(c.id, rc) for rc in d.rchildren
+                    for c in (rc.cache,) if c is not None]  # yay null cache
 
-        existing_locals = set(rc for d in dirs for rc in d.rchildren)
-        # FIXME don't parse the fucking dates unless someone needs them you idiot
-        existing_d = {c.cache.id:c for c in existing_locals if c.cache is not None}  # yay null cache
-        existing_ids = set(existing_d)
+        # walking rchildren is io bound so walk the dirs concurrently
+        existing_d = {id:rc for pairs in Async()(deferred(index_locals)(d) for d in dirs)
+                      for id, rc in pairs}
 
         log.debug(dirs)
         for d in dirs:
@@ -581,13 +706,11 @@ class Main(Dispatcher):
             #d = r.local  # in case a folder moved
             caches = newc.remote.bootstrap(recursive=recursive, only=only, skip=skip)
 
-        new_locals = set(c.local for c in caches if c is not None)  # FIXME 
         new_ids = {c.id:c for c in caches if c is not None}
-        maybe_removed_ids = set(existing_ids) - set(new_ids)
-        maybe_new_ids = set(new_ids) - set(existing_ids)
+        maybe_removed_ids = existing_d.keys() - new_ids.keys()
+        maybe_new_ids = new_ids.keys() - existing_d.keys()
         if maybe_removed_ids:
             # FIXME pull sometimes has fake file extensions
-            from pyontutils.utils import Async, deferred
             from pathlib import PurePath
             maybe_removed = [existing_d[id] for id in maybe_removed_ids]
             maybe_removed_stems = {PurePath(p.parent) / p.stem:p for p in maybe_removed}  # FIXME still a risk of collisions?
@@ -647,19 +770,20 @@ class Main(Dispatcher):
 
         self._print_paths(chain(to_root, self._paths))
 
-        from pyontutils.utils import Async, deferred
         hz = self.options.rate
         fetch = self.options.fetch
         limit = self.options.limit
 
         drs = [d.remote for d in chain(to_root, self._dirs)]
 
+        def refresh_remote(r):
+            c = r.cache
+            return r.refresh(update_data_on_cache=c.is_file() and c.exists())
+
         if not self.options.debug:
-            refreshed = Async(rate=hz)(deferred(r.refresh)(update_data_on_cache=r.cache.is_file() and
-                                                           r.cache.exists()) for r in drs)
+            refreshed = Async(rate=hz)(deferred(refresh_remote)(r) for r in drs)
         else:
-            refreshed = [r.refresh(update_data_on_cache=r.cache.is_file() and
-                                   r.cache.exists()) for r in drs]
+            refreshed = [refresh_remote(r) for r in drs]
 
         moved = []
         parent_moved = []
@@ -684,6 +808,8 @@ class Main(Dispatcher):
             if oldl != newl:
                 moved.append([oldl, newl])
 
+        self._meta_cache.clear()  # directory metadata was just updated
+
         if moved:
             self._print_table(moved, title='Folders moved')
             for old, new in moved:
@@ -709,28 +835,54 @@ class Main(Dispatcher):
         if self.options.pretend:
             return
 
-        from pyontutils.utils import Async, deferred
         hz = self.options.rate
-        Async(rate=hz)(deferred(path.cache.fetch)(size_limit_mb=self.options.limit)
+        limit = self.options.limit
+        Async(rate=hz)(deferred(path.cache.fetch)(size_limit_mb=limit)
                        for path in paths)
 
-    @property
+    @cached_property
     def export_base(self):
         return self.project_path.parent / 'export' / self.project_id
 
-    @property
+    @cached_property
     def LATEST(self):
-        return self.project_path.parent / 'export' / self.project_id / 'LATEST'
+        return self.export_base / 'LATEST'
 
     @property
     def latest_export(self):
-        with open(self.LATEST / 'curation-export.json', 'rt') as f:
-            return json.load(f)
+        # keyed on the LATEST target so that long running
+        # processes like the server see new exports, and kept
+        # on the root dispatcher so that Report and Shell reuse
+        # the parse that Main already did
+        root = self._root
+        latest = self.LATEST.resolve()
+        cached = getattr(root, '_latest_export', None)
+        if cached is None or cached[0] != latest:
+            root._latest_export = latest, load_json_file(latest / 'curation-export.json')
+
+        return root._latest_export[1]
 
     def latest_export_ttl_populate(self, graph):
         # intentionally fail if the ttl export failed
         return graph.parse((self.LATEST / 'curation-export.ttl').as_posix(), format='ttl')
 
+    def _export_unchanged(self, latest_path, digest_name, digest):
+        """ opt in with --skip-unchanged because the ttl outputs also
+            depend on protcur annotations and live ontology labels,
+            neither of which are part of the json that is hashed """
+        if not self.options.skip_unchanged:
+            return False
+
+        # --latest is an explicit request to regenerate from LATEST
+        if self.options.latest:
+            return False
+
+        # keys are sorted so identical data serializes identically
+        latest_digest_path = latest_path / digest_name
+        return (latest_digest_path.exists() and
+                latest_digest_path.read_text() == digest and
+                (not self.options.datasets or (latest_path / 'datasets').exists()))
+
     def export(self):
         """ export output of curation workflows to file """
         #org_id = Integrator(self.project_path).organization.id
@@ -765,14 +917,13 @@ class Main(Dispatcher):
             suffixes = []
             modes = []
             if self.options.json:  # json first since we can cache dowe
-                j = lambda f: json.dump(intr.data, f,
-                                        sort_keys=True, indent=2, cls=JEncode)
+                j = lambda f: f.write(export_json_bytes(intr.data))
                 functions.append(j)
                 suffixes.append('.json')
-                modes.append('wt')
+                modes.append('wb')
 
             if self.options.ttl:
-                t = lambda f: f.write(intr.ttl)
+                t = intr.write_ttl
                 functions.append(t)
                 suffixes.append('.ttl')
                 modes.append('wb')
@@ -805,21 +956,31 @@ class Main(Dispatcher):
         filename = 'curation-export'
         dump_path = self.export_base / timestamp
         latest_path = self.LATEST
+
+        data = self.latest_export if self.options.latest else self.summary.data
+        blob = export_json_bytes(data)
+        digest = hashlib.blake2b(blob).hexdigest()
+        digest_name = filename + '.json.blake2b'
+
+        if self._export_unchanged(latest_path, digest_name, digest):
+            log.info(f'export unchanged from {latest_path.resolve()}')
+            return
+
         if not dump_path.exists():
             dump_path.mkdir(parents=True)
 
         filepath = dump_path / filename
 
-        data = self.latest_export if self.options.latest else self.summary.data
+        with open(filepath.with_suffix('.json'), 'wb') as f:
+            f.write(blob)
 
-        # FIXME we still create a new export folder every time even if the json didn't change ...
-        with open(filepath.with_suffix('.json'), 'wt') as f:
-            json.dump(data, f, sort_keys=True, indent=2, cls=JEncode)
+        del blob
 
         es = ExporterSummarizer(data)
 
-        with open(filepath.with_suffix('.ttl'), 'wb') as f:
-            f.write(es.ttl)
+        # the ttl serializer issues many small writes, give it a big buffer
+        with open(filepath.with_suffix('.ttl'), 'wb', buffering=1 << 20) as f:
+            es.write_ttl(f)
 
         for xml_name, xml in es.xml:
             with open(filepath.with_suffix(f'.{xml_name}.xml'), 'wb') as f:
@@ -827,9 +988,13 @@ class Main(Dispatcher):
 
         # datasets, contributors, subjects, samples, resources
         for table_name, tabular in es.disco:
+            # cells can contain tabs and newlines so keep csv for quoting
+            # but render in memory so that each file gets a single write
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, delimiter='\t', lineterminator='\n')
+            writer.writerows(tabular)
             with open(filepath.with_suffix(f'.{table_name}.tsv'), 'wt') as f:
-                writer = csv.writer(f, delimiter='\t', lineterminator='\n')
-                writer.writerows(tabular)
+                f.write(buffer.getvalue())
 
         if self.options.datasets:
             dataset_dump_path = dump_path / 'datasets'
@@ -839,11 +1004,14 @@ class Main(Dispatcher):
             for dataset_blob in es:
                 filepath = dataset_dump_path / dataset_blob['id']
                 out = filepath.with_suffix(suffix)
-                with open(out, 'wb') as f:
-                    f.write(TriplesExportDataset(dataset_blob).ttl)
+                with open(out, 'wb', buffering=1 << 20) as f:
+                    TriplesExportDataset(dataset_blob).write_ttl(f)
 
                 log.info(f'dataset graph exported to {out}')
 
+        # written after all outputs so that a partial export is never skipped
+        (dump_path / digest_name).write_text(digest)
+
         if latest_path.exists():
             if not latest_path.is_symlink():
                 raise TypeError(f'Why is LATEST not a symlink? {latest_path!r}')
@@ -853,6 +1021,7 @@ class Main(Dispatcher):
         latest_path.symlink_to(dump_path)
 
         if self.options.debug:
+            from IPython import embed
             embed()
 
     def annos(self):
@@ -869,6 +1038,7 @@ class Main(Dispatcher):
             p, *rest = self._paths
             f = Integrator(p)
             all_annos = [list(protc.byIri(uri)) for uri in f.protocol_uris_resolved]
+            from IPython import embed
             embed()
 
     def demos(self):
@@ -958,18 +1128,22 @@ class Main(Dispatcher):
         if paths:
             paths = [p for p in paths if not p.is_dir()]
             search_exists = self.options.exists
-            if self.options.limit:
+            limit = self.options.limit
+            if limit:
                 old_paths = paths
                 paths = [p for p in paths
                          if p.cache.meta.size is None or  # if we have no known size don't limit it
                          search_exists or
-                         not p.exists() and p.cache.meta.size.mb < self.options.limit
+                         not p.exists() and p.cache.meta.size.mb < limit
                          or p.exists() and p.size != p.cache.meta.size and
                          (not log.info(f'Truncated transfer detected for {p}\n'
                                        f'{p.size} != {p.cache.meta.size}'))
-                         and p.cache.meta.size.mb < self.options.limit]
+                         and p.cache.meta.size.mb < limit]
 
-                n_skipped = len(set(p for p in old_paths if p.is_broken_symlink()) - set(paths))
+                # only the paths that were dropped need the symlink check
+                kept = set(paths)
+                n_skipped = sum(1 for p in set(old_paths)
+                                if p not in kept and p.is_broken_symlink())
 
             if self.options.pretend:
                 self._print_paths(paths)
@@ -981,7 +1155,6 @@ class Main(Dispatcher):
                     print(p.cache.meta.as_pretty(pathobject=p))
 
             if self.options.fetch or self.options.refresh:
-                from pyontutils.utils import Async, deferred
                 hz = self.options.rate  # was 30
                 limit = self.options.limit
                 fetch = self.options.fetch
@@ -1006,13 +1179,12 @@ class Main(Dispatcher):
         print(eff, feedback)
 
     def missing(self):
-        for path in self._paths:
-            for rc in path.rchildren:
-                if rc.is_broken_symlink():
-                    m = rc.cache.meta
-                    if m.file_id is None:
-                        #print(rc)
-                        print(m.as_pretty(pathobject=rc))
+        for path in self._dirs:
+            for rc in self._rchildren_broken_symlinks(path):
+                m = rc.cache.meta
+                if m.file_id is None:
+                    #print(rc)
+                    print(m.as_pretty(pathobject=rc))
         #self.bfl.find_missing_meta()
 
     def xattrs(self):
@@ -1131,15 +1303,23 @@ class Main(Dispatcher):
                            key=lambda p: len(p.as_posix()))
 
         if self.options.restore:
-            # horribly inefficient, maybe build on a default dict?
-            rcs = sorted((c for c in stash_base.rchildren if not c.is_dir()), key=lambda p:p.as_posix(), reverse=True)
-            for path in paths:
-                relpath = path.relative_to(self.anchor)
-                for p in rcs:
-                    if p.parts[-len(relpath.parts):] == relpath.parts:
-                        p.copy_to(path, force=True, copy_cache_meta=True)  # FIXME old remote may have been deleted, worth a check?
-                        # TODO checksum? sync?
-                        break
+            targets = {path.relative_to(self.anchor).parts:path for path in paths}
+            lengths = set(len(parts) for parts in targets)
+            rcs = sorted((c for c, is_dir in self._rchildren_is_dir(stash_base) if not is_dir),
+                         key=lambda p:p.as_posix(), reverse=True)
+            # newest stash first so the first match for a tail wins
+            index = {}
+            for p in rcs:
+                for l in lengths:
+                    tail = p.parts[-l:]
+                    if tail in targets and tail not in index:
+                        index[tail] = p
+
+            for parts, path in targets.items():
+                if parts in index:
+                    p = index[parts]
+                    p.copy_to(path, force=True, copy_cache_meta=True)  # FIXME old remote may have been deleted, worth a check?
+                    # TODO checksum? sync?
 
             breakpoint()
 
@@ -1162,8 +1342,9 @@ class Main(Dispatcher):
                     # TODO search existing stashes to see if
                     # we already have a stash of the file
                     log.debug(f'{p!r} {new_path!r}')
-                    new_path.copy_from(p)
-                    pc, npc = p.checksum(), new_path.checksum()
+                    # hash the source while copying instead of reading it twice
+                    pc = copy_and_checksum(p, new_path, cypher=p._cache_class.cypher)
+                    npc = file_checksum(new_path, cypher=p._cache_class.cypher)
                     # TODO a better way to do this might be to
                     # treat the stash as another local for which
                     # the current local is the remote
@@ -1198,6 +1379,9 @@ class Report(Dispatcher):
 
     paths = Main.paths
     _paths = Main._paths
+    _paths_is_dir = Main._paths_is_dir
+    _rchildren_entries = Main._rchildren_entries
+    _rchildren_is_dir = Main._rchildren_is_dir
 
     export_base = Main.export_base
     LATEST = Main.LATEST
@@ -1251,39 +1435,51 @@ class Report(Dispatcher):
         def dead(p):
             raise ValueError(p)
 
+        def probe(p):
+            # xattr reads and stats release the gil so run these in threads
+            m = p.cache.meta if p.cache else dead(p)
+            #if p.is_file() and not any(p.stem.startswith(pf) for pf in self.spcignore):
+            if p.is_file():
+                return 'file', m.size
+            elif p.is_broken_symlink():
+                return 'broken', m.size
+            elif p.is_dir():
+                return 'dir', None
+            else:
+                return None, None
+
         for d in dirs:
             if not Path(d).is_dir():
                 continue  # helper files at the top level, and the symlinks that destory python
             path = Path(d).resolve()
             paths = path.rchildren #list(path.rglob('*'))
-            path_meta = {p:p.cache.meta if p.cache else dead(p) for p in paths
-                         if p.suffix not in ('.swp',)}
+            probes = Async()(deferred(probe)(p) for p in paths
+                             if p.suffix not in ('.swp',))
             outstanding = 0
             total = 0
             tf = 0
             ff = 0
             td = 0
             uncertain = False  # TODO
-            for p, m in path_meta.items():
-                #if p.is_file() and not any(p.stem.startswith(pf) for pf in self.spcignore):
-                if p.is_file() or p.is_broken_symlink():
-                    s = m.size
-                    if s is None:
-                        uncertain = True
-                        continue
-
-                    tf += 1
-                    if s:
-                        total += s
+            for kind, s in probes:
+                if kind == 'dir':
+                    td += 1
+                    continue
+                elif kind is None:
+                    continue
+                elif s is None:
+                    uncertain = True
+                    continue
 
-                    #if '.fake' in p.suffixes:
-                    if p.is_broken_symlink():
-                        ff += 1
-                        if s:
-                            outstanding += s
+                tf += 1
+                if s:
+                    total += s
 
-                elif p.is_dir():
-                    td += 1
+                #if '.fake' in p.suffixes:
+                if kind == 'broken':
+                    ff += 1
+                    if s:
+                        outstanding += s
 
             data.append([path.name,
                          FileSize(total - outstanding),
@@ -1306,25 +1502,33 @@ class Report(Dispatcher):
     def filetypes(self, ext=None):
         key = self._sort_key
         paths = self.paths if self.paths else (self.cwd,)
-        paths = [c for p in paths for c in p.rchildren if not c.is_dir()]
-        rex = re.compile('^\.[0-9][0-9][0-9A-Z]$')
-        rex_paths = [p for p in paths if re.match(rex, p.suffix)]
-        paths = [p for p in paths if not re.match(rex, p.suffix)]
+        rex = re.compile(r'^\.[0-9][0-9][0-9A-Z]$')
+        match = rex.match
+        rex_paths, other_paths = [], []
+        for c in (c for p in paths for c, is_dir in self._rchildren_is_dir(p) if not is_dir):
+            (rex_paths if match(c.suffix) else other_paths).append(c)
 
-        def count(thing):
-            return sorted([(k if k else '', v) for k, v in
-                            Counter([getattr(f, thing)
-                                     for f in paths]).items()], key=key)
+        paths = other_paths
 
-        each = {t:count(t) for t in ('suffix', 'mimetype', '_magic_mimetype')}
+        # mimetypes are expensive so compute each one once and
+        # derive the per attribute counts from the aligned counts
+        aligned = Counter((f.suffix, f.mimetype, f._magic_mimetype) for f in paths)
+
+        def count(index):
+            counter = Counter()
+            for k, v in aligned.items():
+                counter[k[index]] += v
+
+            return sorted([(k if k else '', v) for k, v in counter.items()], key=key)
+
+        each = {t:count(i) for i, t in enumerate(('suffix', 'mimetype', '_magic_mimetype'))}
         each['suffix'].append((rex.pattern, len(rex_paths)))
 
         for title, rows in each.items():
             yield self._print_table(((title, 'count'), *rows), title=title.replace('_', ' ').strip())
 
         all_counts = sorted([(*[m if m else '' for m in k], v) for k, v in
-                                Counter([(f.suffix, f.mimetype, f._magic_mimetype)
-                                        for f in paths]).items()], key=key)
+                             aligned.items()], key=key)
 
         header = ['suffix', 'mimetype', 'magic mimetype', 'count']
         return self._print_table((header, *all_counts),
@@ -1337,12 +1541,13 @@ class Report(Dispatcher):
         key = self._sort_key
         # FIXME we need the blob wrapper in addition to the blob generator
         # FIXME these are the normalized ones ...
-        samples_headers = tuple(k for dataset_blob in datasets
-                                 if 'samples' in dataset_blob  # FIXME inputs?
-                                 for samples_blob in dataset_blob['samples']
-                                 for k in samples_blob)
-        counts = tuple(kv for kv in sorted(Counter(samples_headers).items(),
-                                            key=key))
+        samples_headers = Counter()
+        for dataset_blob in datasets:
+            if 'samples' in dataset_blob:  # FIXME inputs?
+                for samples_blob in dataset_blob['samples']:
+                    samples_headers.update(samples_blob.keys())
+
+        counts = tuple(sorted(samples_headers.items(), key=key))
 
         rows = ((f'Column Name unique = {len(counts)}', '#'), *counts)
         return self._print_table(rows, title='Samples Report', ext=ext)
@@ -1353,12 +1558,13 @@ class Report(Dispatcher):
         key = self._sort_key
         # FIXME we need the blob wrapper in addition to the blob generator
         # FIXME these are the normalized ones ...
-        subjects_headers = tuple(k for dataset_blob in datasets
-                                 if 'subjects' in dataset_blob  # FIXME inputs?
-                                 for subject_blob in dataset_blob['subjects']
-                                 for k in subject_blob)
-        counts = tuple(kv for kv in sorted(Counter(subjects_headers).items(),
-                                            key=key))
+        subjects_headers = Counter()
+        for dataset_blob in datasets:
+            if 'subjects' in dataset_blob:  # FIXME inputs?
+                for subject_blob in dataset_blob['subjects']:
+                    subjects_headers.update(subject_blob.keys())
+
+        counts = tuple(sorted(subjects_headers.items(), key=key))
 
         rows = ((f'Column Name unique = {len(counts)}', '#'), *counts)
         return self._print_table(rows, title='Subjects Report', ext=ext)
@@ -1479,17 +1685,14 @@ class Report(Dispatcher):
         # cells
         # subcelluar
         import rdflib
-        # FIXME cache these results and only recompute if latest changes?
-        if self.options.raw:
-            graph = self.summary.triples_exporter.graph
-        else:
-            graph = rdflib.Graph()
-            self.latest_export_ttl_populate(graph)
-
-        objects = set()
-        skipped_prefixes = set()
-        for t in graph:
-            for e in t:
+        def graph_objects(graph):
+            objects = set()
+            skipped_prefixes = set()
+            # the same iris show up in many triples, so dedupe
+            # them first and only construct one OntId for each
+            nodes = graph.all_nodes()
+            nodes.update(graph.predicates())
+            for e in nodes:
                 if isinstance(e, rdflib.URIRef):
                     oid = OntId(e)
                     if oid.prefix in want_prefixes:
@@ -1497,6 +1700,23 @@ class Report(Dispatcher):
                     else:
                         skipped_prefixes.add(oid.prefix)
 
+            return objects, skipped_prefixes
+
+        if self.options.raw:
+            objects, skipped_prefixes = graph_objects(self.summary.triples_exporter.graph)
+        else:
+            # parsing the ttl export is slow, so keep the results
+            # around until LATEST points somewhere else
+            root = self._root
+            latest = self.LATEST.resolve()
+            cached = getattr(root, '_latest_terms', None)
+            if cached is None or cached[0] != latest:
+                graph = rdflib.Graph()
+                self.latest_export_ttl_populate(graph)
+                root._latest_terms = latest, graph_objects(graph)
+
+            objects, skipped_prefixes = root._latest_terms[1]
+
         if self.options.server and isinstance(ext, types.FunctionType):
             def reformat(ot):
                 return [ot.label if hasattr(ot, 'label') and ot.label else '', ot.atag(curie=True)]
@@ -1509,26 +1729,27 @@ class Report(Dispatcher):
         objs = [OntTerm(o) if o.prefix not in ('TEMP', 'sparc') or
                 o.prefix == 'TEMP' and o.suffix.isdigit() else
                 o for o in objects]
-        term_sets = {title:[o for o in objs if o.prefix == prefix]
-                     for prefix, title in
-                     (('NCBITaxon', 'Species'),
-                      ('UBERON', 'Anatomy and age category'),  # FIXME
-                      ('FMA', 'Anatomy (FMA)'),
-                      ('PATO', 'Qualities'),
-                      ('tech', 'Techniques'),
-                      ('unit', 'Units'),
-                      ('sparc', 'MIS terms'),
-                      ('TEMP', 'Suggested terms'),
-                     )}
-
-        term_sets['Other'] = set(objs) - set(ot for v in term_sets.values() for ot in v)
+        # sort everything once, the buckets below preserve the order
+        # prefixes repeat heavily so compare their ranks not the strings
+        prefix_rank = {p:i for i, p in enumerate(sorted(set(ot.prefix for ot in objs)))}
+        objs = sorted(objs, key=lambda ot: (prefix_rank[ot.prefix], ot.label.lower()
+                                            if hasattr(ot, 'label') and ot.label else ''))
+        prefix_title = {'NCBITaxon': 'Species',
+                        'UBERON': 'Anatomy and age category',  # FIXME
+                        'FMA': 'Anatomy (FMA)',
+                        'PATO': 'Qualities',
+                        'tech': 'Techniques',
+                        'unit': 'Units',
+                        'sparc': 'MIS terms',
+                        'TEMP': 'Suggested terms',}
+
+        term_sets = {title:[] for title in (*prefix_title.values(), 'Other')}
+        for o in objs:
+            term_sets[prefix_title.get(o.prefix, 'Other')].append(o)
 
         for title, terms in term_sets.items():
             header = [['Label', 'CURIE']]
-            rows = header + [reformat(ot) for ot in
-                            sorted(terms,
-                                   key=lambda ot: (ot.prefix, ot.label.lower()
-                                                   if hasattr(ot, 'label') and ot.label else ''))]
+            rows = chain(header, (reformat(ot) for ot in terms))
 
             yield self._print_table(rows, title=title, ext=ext)
 
@@ -1537,7 +1758,10 @@ class Shell(Dispatcher):
     # property ports
     paths = Main.paths
     _paths = Main._paths
+    _paths_is_dir = Main._paths_is_dir
     _build_paths = Main._build_paths
+    _rchildren_entries = Main._rchildren_entries
+    _rchildren_is_dir = Main._rchildren_is_dir
     datasets = Main.datasets
     datasets_local = Main.datasets_local
     export_base = Main.export_base
@@ -1553,7 +1777,7 @@ class Shell(Dispatcher):
         dsd = {d.meta.id:d for d in datasets}
         ds = datasets
         summary = self.summary
-        org = Integrator(self.project_path)
+        org = self.integrator
 
         p, *rest = self._paths
         if p.cache.is_dataset():
@@ -1570,23 +1794,23 @@ class Shell(Dispatcher):
         asdf = rcs[-1]
         urg = list(asdf.data)
         resp = asdf.data_headers
+        from IPython import embed
         embed()
 
     def affil(self):
-        from pyontutils.utils import Async, deferred
         from sparcur.sheets import Affiliations
         a = Affiliations()
         m = a.mapping
         rors = sorted(set(_ for _ in m.values() if _))
         #dat = Async(rate=5)(deferred(lambda r:r.data)(i) for i in rors)
         dat = [r.data for r in rors]  # once the cache has been populated
+        from IPython import embed
         embed()
 
     def protocols(self):
         """ test protocol identifier functionality """
-        org = Integrator(self.project_path)
+        org = self.integrator
         from sparcur.core import get_right_id, AutoId, DoiId, PioId, PioInst
-        from pyontutils.utils import Async, deferred
         skip = '"none"', 'NA', 'no protocols', 'take protocol from other spreadsheet, '
         asdf = [us for us in sorted(org.organs_sheet.byCol.protocol_url_1)
                 if us not in skip and us and ',' not in us]
@@ -1597,6 +1821,7 @@ class Shell(Dispatcher):
         #dat = Async(rate=5)(deferred(lambda p: p.data)(i) for i in pis)
         #dois = [d['protocol']['doi'] for d in dat if d]
         dois = [p.doi for p in pis]
+        from IPython import embed
         embed()
 
     def integration(self):
@@ -1610,6 +1835,7 @@ class Shell(Dispatcher):
         pj = list(intr.protocol_jsons)
         pc = list(intr.triples_exporter.protcur)
         #apj = [pj for c in intr.anchor.children for pj in c.protocol_jsons]
+        from IPython import embed
         embed()
 
 
@@ -1635,40 +1861,51 @@ class Fix(Shell):
 
         nall = self.stash(paths, stashmetafunc=sf)
         [print(n.cache.meta.as_pretty(n)) for n in nall]
+        from IPython import embed
         embed()
         # once everything is in order and backed up 
         # [p.cache.fetch() for p in paths]
 
     def duplicates(self):
-        all_ = defaultdict(list)
         if not self.options.path:
             paths = self.anchor.local.rchildren
         else:
             paths = self.paths
 
-        for rc in paths:
-            if rc.cache is None:
-                if not rc.skip_cache:
-                    log.critical(f'WHAT THE WHAT {rc}')
+        def cached(paths):
+            for rc in paths:
+                # constructing the cache object is not free, do it once
+                cache = rc.cache
+                if cache is None:
+                    if not rc.skip_cache:
+                        log.critical(f'WHAT THE WHAT {rc}')
 
-                continue
+                    continue
+
+                if cache.id is None:
+                    # nothing to be a duplicate of and None does not sort
+                    continue
 
-            all_[rc.cache.id].append(rc)
+                yield cache.id, rc
 
         def mkey(p):
-            mns = p.cache.meta
+            mns = self._meta(p)
             return (not bool(mns),
                     not bool(mns.updated),
                     -mns.updated.timestamp())
 
-        dupes = {i:sorted(l, key=mkey)#, reverse=True)
-                 for i, l in all_.items() if len(l) > 1}
-        dv = list(dupes.values())
+        # sorting by id puts duplicates next to each other
+        dv = []
+        for _, group in groupby(sorted(cached(paths), key=itemgetter(0)), key=itemgetter(0)):
+            group = [rc for _, rc in group]
+            if len(group) > 1:
+                dv.append(sorted(group, key=mkey))#, reverse=True)
+
         deduped = [a.dedupe(b, pretend=True) for a, b, *c in dv
                    if (not log.warning(c) if c else not c)
         ]  # FIXME assumes a single dupe...
         to_remove = [d for paths, new in zip(dv, deduped) for d in paths if d != new]
-        to_remove_size = [p for p in to_remove if p.cache.meta.size is not None]
+        to_remove_size = [p for p in to_remove if self._meta(p).size is not None]
         #[p.unlink() for p in to_remove if p.cache.meta.size is None] 
         breakpoint()
 
@@ -1687,7 +1924,7 @@ def main():
         ll.mkdir(parents=True)  # FIXME switch to a .local folder or something
 
     lf = ll / isoformat_safe(utcnowtz())
-    lfh = logging.FileHandler(lf.as_posix())
+    lfh = BufferedFileHandler(lf.as_posix())
     lfh.setFormatter(log.handlers[0].formatter)
     log.addHandler(lfh)
     logd.addHandler(lfh)
@@ -1,5 +1,6 @@
 import copy
 import json
+import mmap
 import shutil
 import itertools
 from pathlib import Path
@@ -24,6 +25,10 @@ from pyontutils.namespaces import prot, proc, tech, asp, dim, unit, rdf, owl, rd
 from sparcur import exceptions as exc
 from sparcur.utils import log, logd, cache, python_identifier  # FIXME fix other imports
 from sparcur.config import config, auth
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 # disk cache decorator
@@ -99,6 +104,39 @@ class JEncode(json.JSONEncoder):
         return json.JSONEncoder.default(self, obj)
 
 
+_jencode = JEncode()
+if orjson is not None:
+    _orjson_export_options = (orjson.OPT_SORT_KEYS |
+                              orjson.OPT_INDENT_2 |
+                              orjson.OPT_NON_STR_KEYS)
+
+
+def export_json_bytes(data):
+    """ sorted, indented json for export files as utf-8 bytes
+        uses orjson when it is installed since the stdlib encoder
+        is very slow with sort_keys and indent on large exports
+
+        the orjson output differs from the stdlib output in that
+        non-ascii text is written as utf-8 instead of \\u escapes,
+        non-finite floats are written as null, and non-str keys
+        are sorted as strings, so int keys come out 1, 10, 2 """
+    if orjson is None:
+        return json.dumps(data, sort_keys=True, indent=2, cls=JEncode).encode()
+
+    return orjson.dumps(data, default=_jencode.default, option=_orjson_export_options)
+
+
+def load_json_file(path):
+    """ parse a potentially very large json file
+        mmap and orjson are used when orjson is available """
+    with open(path, 'rb') as f:
+        if orjson is None:
+            return json.load(f)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as mv:
+            return orjson.loads(mv)
+
+
 def zipeq(*iterables):
     """ zip or fail if lengths do not match """
 
@@ -205,6 +243,10 @@ class DoiInst(URIInstrumentation, DoiId):
 
     @property
     def metadata(self):
+        return self._metadata(self.suffix)
+
+    @cache(Path(auth.get_path('cache-path'), 'doi_json'), create=True)
+    def _metadata(self, suffix):
         # e.g. crossref, datacite, etc.
         # so this stuff isnt quite to the spec that is doccumented here
         # https://crosscite.org/docs.html
@@ -633,6 +633,11 @@ class TriplesExport(ProtcurData):
     def ttl(self):
         return self.graph.serialize(format='nifttl')
 
+    def write_ttl(self, stream):
+        """ serialize directly to a binary stream so that the
+            full ttl string never has to be held in memory """
+        self.graph.serialize(destination=stream, format='nifttl')
+
     def populate(self, graph):
         def warn(triple):
             for element in triple:
@@ -919,6 +924,9 @@ class Integrator(PathData, OntologyData):
     def ttl(self):
         return self.triples_class(self.data).ttl
 
+    def write_ttl(self, stream):
+        self.triples_class(self.data).write_ttl(stream)
+
     @property
     def name(self):
         return self.path.name
@@ -1369,6 +1377,9 @@ class ExporterSummarizer:
     def ttl(self):
         return self.triples_exporter.ttl
 
+    def write_ttl(self, stream):
+        self.triples_exporter.write_ttl(stream)
+
 
 hasSchema = sc.HasSchema()
 @hasSchema.mark
@@ -2,6 +2,7 @@ import sys
 import json
 from urllib import parse
 from pathlib import Path
+from functools import lru_cache
 from getpass import getpass
 from argparse import Namespace
 from oauth2client import file, client
@@ -9,25 +10,28 @@ from .config import auth
 
 
 def get_auth_code(url):
-    import robobrowser
-    br = robobrowser.RoboBrowser()
-    br.open(url)
-    form = br.get_form(id=0)
-    if form is None:
+    import requests
+    import lxml.html
+    session = requests.Session()
+    resp = session.get(url)
+    forms = lxml.html.fromstring(resp.content, base_url=resp.url).forms
+    if not forms:
         raise ValueError('No form! Do you have the right client id?')
+
+    form = forms[0]
     print('If you registered using google please navigate to\n'
           'the url below and leave email and password blank.')
     print()
     print(url)
     print()
-    print(form)
+    print(list(form.fields.keys()))
     print()
     print('protocols.io OAuth form')
-    e = form['email'].value = input('Email: ')
-    p = form['password'].value = getpass()
+    e = form.fields['email'] = input('Email: ')
+    p = form.fields['password'] = getpass()
     if e and p:
-        br.submit_form(form)
-        params = dict(parse.parse_qsl(parse.urlsplit(br.url).query))
+        resp = session.request(form.method, form.action or resp.url, data=form.form_values())
+        params = dict(parse.parse_qsl(parse.urlsplit(resp.url).query))
 
     elif (not e or not p) or 'code' not in params:
         print('If you are logging in via a 3rd party services\n'
@@ -67,8 +71,12 @@ def run_flow(flow, storage):
     return credential
 
 
+@lru_cache(maxsize=8)
 def get_protocols_io_auth(creds_file,
                           store_file=auth.get_path('protocols-io-api-store-file')):
+    """ memoized for the life of the process, call
+        get_protocols_io_auth.cache_clear() if the stored
+        credentials are revoked or replaced """
     flags = Namespace(noauth_local_webserver=True,
                       logging_level='INFO')
     sfile = store_file
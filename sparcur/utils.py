@@ -2,6 +2,7 @@ import io
 import json
 import hashlib
 import inspect
+import logging
 from pathlib import Path
 from functools import wraps
 from augpathlib.utils import log as _alog
@@ -32,6 +33,34 @@ class _log:
     def critical(nothing): pass
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """ FileHandler that lets writes collect in the file buffer instead
+        of flushing after every record, errors are still flushed right
+        away, everything else is flushed by logging.shutdown at exit """
+
+    def __init__(self, filename, buffering=1 << 16, **kwargs):
+        self.buffering = buffering
+        super().__init__(filename, **kwargs)
+
+    def _open(self):
+        # errors was added to FileHandler in 3.9
+        return open(self.baseFilename, self.mode, buffering=self.buffering,
+                    encoding=self.encoding, errors=getattr(self, 'errors', None))
+
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
 want_prefixes = ('TEMP', 'FMA', 'UBERON', 'PATO', 'NCBITaxon', 'ilxtr', 'sparc',
                  'BIRNLEX', 'tech', 'unit', 'ILX', 'lex',)
 
@@ -69,6 +98,45 @@ def cache_hash(pairs, cypher=hashlib.blake2s):
     return m.hexdigest()
 
 
+def file_checksum(path, cypher=hashlib.sha256, chunksize=1 << 20):
+    """ digest of the contents of path, hashlib.file_digest
+        keeps the read loop in C when it is available (3.11+) """
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, cypher).digest()
+
+        m = cypher()
+        buffer = bytearray(chunksize)
+        view = memoryview(buffer)
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+
+            m.update(view[:n])
+
+    return m.digest()
+
+
+def copy_and_checksum(source, target, cypher=hashlib.sha256, chunksize=1 << 20):
+    """ copy source to target computing the digest of the source
+        on the way through so that it only has to be read once """
+    m = cypher()
+    buffer = bytearray(chunksize)
+    view = memoryview(buffer)
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        while True:
+            n = src.readinto(buffer)
+            if not n:
+                break
+
+            chunk = view[:n]
+            m.update(chunk)
+            dst.write(chunk)
+
+    return m.digest()
+
+
 def argspector(function):
     argspec = inspect.getfullargspec(function)
     def spector(*args, **kwargs):
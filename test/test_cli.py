@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from sparcur.paths import Path
+from sparcur.cli import Main
+
+
+class TestRchildrenIsDir(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.temp = Path(temp.name)
+        self.main = Main.__new__(Main)  # the walk does not need dispatcher state
+
+    def walk(self, path):
+        return sorted(self.main._rchildren_is_dir(path))
+
+    def test_directory(self):
+        (self.temp / 'a' / 'b').mkdir(parents=True)
+        (self.temp / 'a' / 'file').touch()
+        (self.temp / 'a' / 'b' / 'deep').touch()
+        expect = sorted((p, p.is_dir()) for p in self.temp.rglob('*'))
+        assert self.walk(self.temp) == expect
+
+    def test_symlinked_directory(self):
+        target = self.temp / 'target'
+        (target / 'sub').mkdir(parents=True)
+        (target / 'f').touch()
+        link = self.temp / 'link'
+        os.symlink(target, link)
+        expect = sorted((p, p.is_dir()) for p in link.rglob('*'))
+        assert [p.name for p, _ in expect] == ['f', 'sub']
+        assert self.walk(link) == expect
+
+    def test_file(self):
+        file = self.temp / 'file'
+        file.touch()
+        assert self.walk(file) == []
+
+    def test_broken_symlink(self):
+        link = self.temp / 'link'
+        os.symlink(self.temp / 'does-not-exist', link)
+        assert self.walk(link) == []
+
+    def test_missing(self):
+        assert self.walk(self.temp / 'does-not-exist') == []
+
+
+class TestExportUnchanged(unittest.TestCase):
+    digest_name = 'curation-export.json.blake2b'
+    digest = 'abc123'
+
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.latest = Path(temp.name) / 'LATEST'
+        self.latest.mkdir()
+        (self.latest / self.digest_name).write_text(self.digest)
+        self.main = Main.__new__(Main)
+
+    def unchanged(self, digest=None, **options):
+        self.main.options = SimpleNamespace(**{'skip_unchanged': True,
+                                               'latest': False,
+                                               'datasets': False,
+                                               **options})
+        return self.main._export_unchanged(self.latest, self.digest_name,
+                                           self.digest if digest is None else digest)
+
+    def test_skip(self):
+        assert self.unchanged()
+
+    def test_skip_datasets(self):
+        (self.latest / 'datasets').mkdir()
+        assert self.unchanged(datasets=True)
+
+    def test_no_skip_without_flag(self):
+        assert not self.unchanged(skip_unchanged=False)
+
+    def test_no_skip_latest(self):
+        assert not self.unchanged(latest=True)
+
+    def test_no_skip_changed(self):
+        assert not self.unchanged(digest='def456')
+
+    def test_no_skip_no_sidecar(self):
+        (self.latest / self.digest_name).unlink()
+        assert not self.unchanged()
+
+    def test_no_skip_missing_datasets(self):
+        assert not self.unchanged(datasets=True)
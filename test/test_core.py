@@ -1,5 +1,12 @@
+import json
+import tempfile
 import unittest
+from pathlib import Path
+from collections import deque
+from unittest.mock import patch
+from sparcur import core
 from sparcur.core import OrcidId
+from sparcur.core import export_json_bytes, load_json_file
 from sparcur.core import adops, DictTransformer
 from sparcur.derives import Derives as De
 
@@ -14,6 +21,32 @@ class TestOrcidId(unittest.TestCase):
         assert not bads, str(bads)
 
 
+class TestExportJson(unittest.TestCase):
+    data = {'id': 'N:organization:fake',
+            'meta': {'count': 2, 'folder_name': 'fäke'},
+            'datasets': [{'id': 'N:dataset:1', 'keywords': deque(['a', 'b'])},
+                         {'id': 'N:dataset:2', 'path': Path('/tmp/some/path')}],}
+    expect = json.loads(json.dumps(data, cls=core.JEncode))
+
+    def test_fallback_matches_orjson(self):
+        if core.orjson is None:
+            self.skipTest('orjson not installed')
+
+        fast = export_json_bytes(self.data)
+        with patch.object(core, 'orjson', None):
+            slow = export_json_bytes(self.data)
+
+        assert json.loads(fast) == json.loads(slow) == self.expect
+
+    def test_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp:
+            path = Path(temp, 'export.json')
+            path.write_bytes(export_json_bytes(self.data))
+            assert load_json_file(path) == self.expect
+            with patch.object(core, 'orjson', None):
+                assert load_json_file(path) == self.expect
+
+
 class Examples:
     # yield expect, data, args
     @property
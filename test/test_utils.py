@@ -1,5 +1,10 @@
+import os
+import hashlib
+import tempfile
 import unittest
-from sparcur.utils import cache_hash, argspector
+from unittest.mock import patch
+from pathlib import Path
+from sparcur.utils import cache_hash, argspector, copy_and_checksum, file_checksum
 
 
 class TestCacheHash(unittest.TestCase):
@@ -33,3 +38,38 @@ class TestCacheHash(unittest.TestCase):
             for args, kwargs in arg_sets:
                 pairs = list(spector(*args, **kwargs))
                 cache_hash(pairs)
+
+
+class TestChecksum(unittest.TestCase):
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.temp = Path(temp.name)
+        self.source = self.temp / 'source'
+        # larger than one chunk and not a multiple of the chunk size
+        self.content = os.urandom((1 << 20) * 2 + 12345)
+        self.source.write_bytes(self.content)
+
+    def test_copy_and_checksum(self):
+        target = self.temp / 'target'
+        digest = copy_and_checksum(self.source, target)
+        assert target.read_bytes() == self.content
+        assert digest == hashlib.sha256(self.content).digest()
+        assert digest == file_checksum(target)
+
+    def test_cypher(self):
+        target = self.temp / 'target'
+        digest = copy_and_checksum(self.source, target, cypher=hashlib.blake2b, chunksize=4096)
+        assert target.read_bytes() == self.content
+        assert digest == hashlib.blake2b(self.content).digest()
+        assert digest == file_checksum(target, cypher=hashlib.blake2b)
+
+    def test_file_checksum_fallback(self):
+        expect = hashlib.sha256(self.content).digest()
+        if hasattr(hashlib, 'file_digest'):
+            # patch restores file_digest on exit, del hides it from hasattr
+            with patch.object(hashlib, 'file_digest', None):
+                del hashlib.file_digest
+                assert file_checksum(self.source) == expect
+
+        assert file_checksum(self.source) == expect